@@ -1,16 +1,323 @@
 import re
 import os
+import json
+import asyncio
 
+import aiohttp
+import lxml.html
+import pyarrow as pa
+import pyarrow.parquet as pq
 import requests
 import pandas as pd
 import matplotlib.pyplot as plt
 import folium
 from itertools import chain
-from bs4 import BeautifulSoup
-from collections import Counter
-from datetime import date, datetime
+from bs4 import BeautifulSoup, SoupStrainer
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import date
 from fake_useragent import UserAgent
+from functools import lru_cache
 from geopy.geocoders import Nominatim
+from geopy.extra.rate_limiter import RateLimiter
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+ua = UserAgent()
+
+session = requests.Session()
+session.headers["User-Agent"] = ua.random
+session.headers["Accept-Encoding"] = "gzip, deflate, br"
+session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods={"GET"},
+            respect_retry_after_header=True,
+        ),
+    ),
+)
+
+
+link_strainer = SoupStrainer("a", attrs={"class": "bloko-link", "target": "_blank"})
+
+vacancy_link_re = re.compile(r"https:\/\/perm.hh.ru\/")
+vacancy_id_re = re.compile(r"[a-zA-Z:\/.]*([0-9]+)\?")
+
+months = {
+    "января": 1,
+    "февраля": 2,
+    "марта": 3,
+    "апреля": 4,
+    "мая": 5,
+    "июня": 6,
+    "июля": 7,
+    "августа": 8,
+    "сентября": 9,
+    "октября": 10,
+    "ноября": 11,
+    "декабря": 12,
+}
+
+vacancy_title_xp = etree.XPath("//h1[starts-with(@data-qa, 'vacancy-title')]")
+company_name_xp = etree.XPath("//span[contains(@class, 'bloko-header-section-2')]")
+rating_xp = etree.XPath("//div[@data-qa='employer-review-small-widget-total-rating']")
+city_xp = etree.XPath(
+    "//*[contains(@data-qa, 'vacancy-view-location')"
+    " or contains(@data-qa, 'vacancy-view-raw-address')]"
+)
+experience_xp = etree.XPath("//span[@data-qa='vacancy-experience']")
+employment_mode_xp = etree.XPath("//p[@data-qa='vacancy-view-employment-mode']")
+pub_date_xp = etree.XPath(
+    "//p[contains(@class, 'vacancy-creation-time-redesigned')]//span"
+)
+skills_xp = etree.XPath("//li[@data-qa='skills-element']")
+
+category_patterns = [
+    (
+        re.compile(
+            r"(?:.*data.+anal.*)|(?:.*data.+анал.*)|(?:.*анал.*дан.*)|(?:\bda\b)",
+            flags=re.IGNORECASE,
+        ),
+        "Data Analyst",
+    ),
+    (
+        re.compile(
+            r"(?:.*bi.+anal.*)|(?:\bbi\b)|(?:.*bi.+анал.*)|(?:.*анал.*bi.*)",
+            flags=re.IGNORECASE,
+        ),
+        "BI Analyst",
+    ),
+    (
+        re.compile(
+            r"(?:.*product.*)|(?:.*prod.+анал.*)|(?:.*анал.*прод.*)|(?:.*продукт.*)",
+            flags=re.IGNORECASE,
+        ),
+        "Product Analyst",
+    ),
+    (
+        re.compile(
+            r"(?:.*веб.*)|(?:.*web.+анал.*)|(?:.*анал.*web.*)|(?:\bweb\b)",
+            flags=re.IGNORECASE,
+        ),
+        "Web Analyst",
+    ),
+    (
+        re.compile(r"(?:.*engin.*)|(?:.*инжен.*)|(?:\bde\b)", flags=re.IGNORECASE),
+        "Data Engineer",
+    ),
+    (
+        re.compile(
+            r"(?:.*data.+scien.*)|(?:.*scien.*)|(?:\bds\b)", flags=re.IGNORECASE
+        ),
+        "Data Scientist",
+    ),
+]
+
+vacancy_columns = [
+    "id",
+    "vacancy_name",
+    "experience",
+    "work_type",
+    "busyness",
+    "city",
+    "company",
+    "rating",
+    "skills",
+    "pub_date",
+    "url",
+]
+
+vacancy_schema = pa.schema(
+    [
+        pa.field(column, pa.list_(pa.string()) if column == "skills" else pa.string())
+        for column in vacancy_columns
+    ]
+)
+
+
+geocache_path = "geocache.json"
+geocache = {}
+
+if os.path.exists(geocache_path):
+    with open(geocache_path) as f:
+        geocache = json.load(f)
+
+geolocator = Nominatim(user_agent="myuseragent")
+rate_limited_geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1)
+
+
+@lru_cache(maxsize=4096)
+def geocode_city(city):
+    """
+    Geocode a city name into coordinates. Results are cached in memory
+    and persisted in geocache.json between runs.
+    Args:
+        city (str): name of the city.
+    Returns:
+        tuple: (latitude, longitude) of the city or None if not found.
+    """
+    if city in geocache:
+        return tuple(geocache[city])
+
+    location = rate_limited_geocode(city)
+    if location is None:
+        return None
+    geocache[city] = [location.latitude, location.longitude]
+    return (location.latitude, location.longitude)
+
+
+def save_geocache():
+    """
+    Save the geocoding cache to geocache.json.
+    Args:
+        None
+    Returns:
+        None
+    """
+    with open(geocache_path, "w") as f:
+        json.dump(geocache, f, ensure_ascii=False)
+    return None
+
+
+def stream_vacancies_id(response):
+    """
+    Extract vacancy ids from a streamed search page response.
+    The body is fed chunk by chunk to an incremental lxml parser, so only
+    the matched link elements are kept in memory instead of the full DOM.
+    Args:
+        response: streamed requests response with the search page.
+    Returns:
+        list: list of vacancy ids.
+    """
+    parser = etree.HTMLPullParser(events=("end",))
+    vacancies_id = []
+
+    for chunk in response.iter_content(chunk_size=8192):
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if (
+                elem.tag == "a"
+                and "bloko-link" in elem.get("class", "")
+                and elem.get("target") == "_blank"
+                and vacancy_link_re.search(elem.get("href", ""))
+            ):
+                vacancies_id.extend(vacancy_id_re.findall(elem.get("href")))
+            elem.clear()
+
+    return vacancies_id
+
+
+def get_current_vacancies_id(soup):
+    """
+    Get the ids of the current vacancies from the parsed HTML soup.
+    Args:
+        soup: parsed HTML soup object.
+    Returns:
+        list: list of vacancy ids.
+    """
+    page_links = soup.find_all(
+        "a",
+        attrs={
+            "class": "bloko-link",
+            "target": "_blank",
+            "href": vacancy_link_re,
+        },
+    )
+    vacancies_id = [vacancy_id_re.findall(link["href"]) for link in page_links]
+    return list(chain(*vacancies_id))
+
+
+def first_text(tree, xpath, default=None):
+    """
+    Get the text of the first element matched by a precompiled XPath.
+    Args:
+        tree: parsed lxml tree of the page.
+        xpath: precompiled etree.XPath expression.
+        default: value to return when nothing matches.
+    Returns:
+        str: text of the first matched element or default.
+    """
+    elements = xpath(tree)
+    if elements:
+        return elements[0].text_content()
+    return default
+
+
+def extract_vacancy_fields(tree):
+    """
+    Extract all vacancy fields from a pre-parsed vacancy page tree.
+    Args:
+        tree: parsed lxml tree of the vacancy page.
+    Returns:
+        dict: mapping of field names to the extracted values (None for
+              fields missing on the page).
+    """
+    city = first_text(tree, city_xp)
+    if city is not None:
+        city = city.split(", ")[0]
+
+    work_type = busyness = None
+    employment = first_text(tree, employment_mode_xp)
+    if employment is not None:
+        parts = employment.split(", ")
+        if len(parts) == 2:
+            work_type, busyness = parts
+
+    return {
+        "vacancy_name": first_text(tree, vacancy_title_xp),
+        "experience": first_text(tree, experience_xp),
+        "work_type": work_type,
+        "busyness": busyness,
+        "city": city,
+        "company": first_text(tree, company_name_xp),
+        "rating": first_text(tree, rating_xp),
+        "skills": [skill.text_content() for skill in skills_xp(tree)],
+        "pub_date": first_text(tree, pub_date_xp),
+    }
+
+
+def parse_vacancy_page(vacancy_id, url, html):
+    """
+    Extract the vacancy fields from a vacancy page.
+    Args:
+        vacancy_id (str): id of the vacancy.
+        url (str): url of the vacancy page.
+        html (bytes): raw HTML of the vacancy page.
+    Returns:
+        list: list of vacancy fields or None if the page could not be parsed.
+    """
+    try:
+        tree = lxml.html.fromstring(html)
+    except:
+        return None
+
+    fields = extract_vacancy_fields(tree)
+    if (
+        fields["city"] is None
+        or fields["work_type"] is None
+        or fields["pub_date"] is None
+    ):
+        return None
+
+    return [
+        vacancy_id,
+        fields["vacancy_name"],
+        fields["experience"],
+        fields["work_type"],
+        fields["busyness"],
+        fields["city"],
+        fields["company"],
+        fields["rating"],
+        fields["skills"],
+        fields["pub_date"],
+        url,
+    ]
 
 
 def get_all_vacancies(vacancies, exp="noExperience", page=0, search_period=0):
@@ -26,39 +333,6 @@ def get_all_vacancies(vacancies, exp="noExperience", page=0, search_period=0):
     request_text = "+or+".join(["%22" + i.replace(" ", "+") + "%22" for i in vacancies])
 
     all_vacancies_ids = []
-    df = pd.DataFrame(columns=["id", "vacancy_name"])
-
-    def save_data(all_vacancies_ids):
-        """
-        Save the collected data of vacancies.
-        Args:
-            all_vacancies_ids (list): list of vacancy ids.
-        Returns:
-            pd.DataFrame: appended DataFrame with id columns.
-        """
-        data = pd.DataFrame(zip(all_vacancies_ids), columns=["id"])
-        all_vacancies_ids = []
-        return df.append(data)
-
-    def get_current_vacancies_id(soup):
-        """
-        Get the ids of the current vacancies from the parsed HTML soup.
-        Args:
-            soup: parsed HTML soup object.
-        Returns:
-            list: list of vacancy ids.
-        """
-        page_links = soup.find_all(
-            "a",
-            attrs={
-                "class": "bloko-link",
-                "target": "_blank",
-                "href": re.compile(r"https:\/\/perm.hh.ru\/"),
-            },
-        )
-        pattern = r"[a-zA-Z:\/.]*([0-9]*)\?"
-        vacancies_id = [re.findall(pattern, link["href"]) for link in page_links]
-        return list(chain(*vacancies_id))
 
     while True:
         if page % 10 == 0:
@@ -66,176 +340,202 @@ def get_all_vacancies(vacancies, exp="noExperience", page=0, search_period=0):
 
         url = f"https://hh.ru/search/vacancy?text={request_text}&search_period={search_period}\
                 &items_on_page=15&area=113&experience={exp}&page={page}"
-        headers = {"User-Agent": UserAgent().random}
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            print("Error", response.status_code)
-            df = save_data(all_vacancies_ids)
-            return df
-        soup = BeautifulSoup(response.text)
-        current_vacancies_ids = get_current_vacancies_id(soup)
+        try:
+            response = session.get(url, timeout=(3.05, 15), stream=True)
+            if response.status_code != 200:
+                print("Error", response.status_code)
+                return pd.DataFrame(all_vacancies_ids, columns=["id"])
+            current_vacancies_ids = stream_vacancies_id(response)
+        except requests.RequestException as error:
+            print("Error", error)
+            return pd.DataFrame(all_vacancies_ids, columns=["id"])
         if not current_vacancies_ids:
-            df = save_data(all_vacancies_ids)
-            return df
+            return pd.DataFrame(all_vacancies_ids, columns=["id"])
 
         all_vacancies_ids.extend(current_vacancies_ids)
         page += 1
 
 
-def get_vacancy_info(vacancies_id):
+def rows_to_table(rows):
+    """
+    Convert accumulated vacancy rows into a pyarrow Table.
+    Args:
+        rows (list): list of vacancy field lists.
+    Returns:
+        pa.Table: Table with the vacancy columns.
+    """
+    return pa.Table.from_pylist(
+        [dict(zip(vacancy_columns, row)) for row in rows], schema=vacancy_schema
+    )
+
+
+def get_vacancy_info(vacancies_id, output_path=None, batch_size=500):
     """
     Get details of vacancies based on the provided vacancy IDs.
     Args:
         vacancies_id (list): list of vacancy IDs to fetch details for.
+        output_path (str): path of a Parquet file to flush the vacancies
+                           into every batch_size rows. With an output_path
+                           the memory footprint stays constant and the
+                           caller reads the file back with pd.read_parquet.
+        batch_size (int): number of rows per flushed Parquet row group.
     Returns:
-        pd.DataFrame: DataFrame containing information about the vacancies.
+        pd.DataFrame: DataFrame containing information about the vacancies,
+                      or None if output_path is given.
     """
     counter = 0
-    df = pd.DataFrame(
-        columns=[
-            "id",
-            "vacancy_name",
-            "experience",
-            "work_type",
-            "busyness",
-            "city",
-            "company",
-            "rating",
-            "skills",
-            "pub_date",
-            "url",
-        ]
-    )
+    futures = []
     data = []
+    writer = None
+    if output_path is not None:
+        writer = pq.ParquetWriter(output_path, vacancy_schema, compression="zstd")
 
-    def get_text(soup_tag):
+    def drain(futures):
         """
-        Get soup object.
+        Collect the parsed rows of the given futures.
         Args:
-            soup_tag: soup object containing information.
+            futures (list): list of parse futures.
         Returns:
-            str: text from soup object or None.
+            list: list of vacancy field lists.
         """
-        try:
-            return soup_tag.text
-        except:
-            return None
-
-    for id in vacancies_id:
-        url = "https://hh.ru/vacancy/" + id
-        headers = {"User-Agent": UserAgent().random}
-        response = requests.get(url, headers=headers)
-
-        if response.status_code != 200:
-            print("Error", response.status_code)
-            df = df.append(
-                pd.DataFrame(
-                    data,
-                    columns=[
-                        "id",
-                        "vacancy_name",
-                        "experience",
-                        "work_type",
-                        "busyness",
-                        "city",
-                        "company",
-                        "rating",
-                        "skills",
-                        "pub_date",
-                        "url",
-                    ],
+        rows = []
+        for future in as_completed(futures):
+            row = future.result()
+            if row is not None:
+                rows.append(row)
+        return rows
+
+    try:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for id in vacancies_id:
+                url = "https://hh.ru/vacancy/" + id
+                try:
+                    response = session.get(url, timeout=(3.05, 15))
+                except requests.RequestException as error:
+                    print("Error", error)
+                    continue
+
+                if response.status_code != 200:
+                    print("Error", response.status_code)
+                    continue
+
+                futures.append(
+                    executor.submit(parse_vacancy_page, id, url, response.content)
                 )
-            )
-            return df
 
-        try:
-            soup = BeautifulSoup(response.text)
-            name = get_text(
-                soup.find("h1", attrs={"data-qa": re.compile(r"vacancy-title*")})
-            )
-            company = get_text(
-                soup.find(
-                    "span", attrs={"class": re.compile(r"bloko-header-section-2*")}
-                )
-            )
-            rating = get_text(
-                soup.find(
-                    "div",
-                    attrs={"data-qa": "employer-review-small-widget-total-rating"},
-                )
-            )
-            city = get_text(
-                soup.find(
-                    attrs={
-                        "data-qa": re.compile(
-                            r"(vacancy-view-location)|(vacancy-view-raw-address)"
-                        )
-                    }
-                )
-            ).split(", ")[0]
-            exp = get_text(soup.find("span", attrs={"data-qa": "vacancy-experience"}))
-            work_type, busyness = get_text(
-                soup.find("p", attrs={"data-qa": "vacancy-view-employment-mode"})
-            ).split(", ")
-            pub_date = get_text(
-                soup.find(
-                    "p", attrs={"class": "vacancy-creation-time-redesigned"}
-                ).findChild("span")
-            )
-            skills = [
-                get_text(skill)
-                for skill in (soup.find_all("li", attrs={"data-qa": "skills-element"}))
-            ]
-            data.append(
-                [
-                    id,
-                    name,
-                    exp,
-                    work_type,
-                    busyness,
-                    city,
-                    company,
-                    rating,
-                    skills,
-                    pub_date,
-                    url,
-                ]
-            )
-        except:
-            continue
+                if counter % 10 == 0:
+                    print(f"Vacancy № {counter}")
+                counter += 1
+
+                if writer is not None and len(futures) >= batch_size:
+                    rows = drain(futures)
+                    futures = []
+                    if rows:
+                        writer.write_table(rows_to_table(rows))
+
+            data = drain(futures)
+            if writer is not None and data:
+                writer.write_table(rows_to_table(data))
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is not None:
+        return None
+
+    return pd.DataFrame(data, columns=vacancy_columns)
 
-        if counter % 10 == 0:
-            print(f"Vacancy № {counter}")
-            df = df.append(
-                pd.DataFrame(
-                    data,
-                    columns=[
-                        "id",
-                        "vacancy_name",
-                        "experience",
-                        "work_type",
-                        "busyness",
-                        "city",
-                        "company",
-                        "rating",
-                        "skills",
-                        "pub_date",
-                        "url",
-                    ],
-                )
-            )
-            data = []
-        counter += 1
 
-    return df
+async def get_all_vacancies_async(
+    vacancies, exp="noExperience", search_period=0, batch_size=10
+):
+    """
+    Get all vacancies concurrently with the specified experience level.
+    Search pages are fetched in batches of batch_size until an empty page
+    is met, with at most 20 requests in flight at a time.
+    Args:
+        vacancies (list): list of vacancies to search for.
+        exp (str): experience level, default is 'noExperience'.
+        search_period (int): the number of days back to search for vacancies.
+        batch_size (int): number of search pages fetched per batch.
+    Returns:
+        pd.DataFrame: DataFrame containing the ids of all vacancies found.
+    """
+    request_text = "+or+".join(["%22" + i.replace(" ", "+") + "%22" for i in vacancies])
+    semaphore = asyncio.Semaphore(20)
+
+    async def fetch_page(session, page):
+        url = f"https://hh.ru/search/vacancy?text={request_text}&search_period={search_period}\
+                &items_on_page=15&area=113&experience={exp}&page={page}"
+        async with semaphore:
+            async with session.get(url) as response:
+                if response.status != 200:
+                    print("Error", response.status)
+                    return []
+                html = await response.read()
+        soup = BeautifulSoup(html, "lxml", parse_only=link_strainer)
+        return get_current_vacancies_id(soup)
+
+    all_vacancies_ids = []
+    connector = aiohttp.TCPConnector(limit=50, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        headers={"User-Agent": ua.random, "Accept-Encoding": "gzip, deflate, br"},
+    ) as session:
+        page = 0
+        while True:
+            tasks = [fetch_page(session, page + i) for i in range(batch_size)]
+            results = await asyncio.gather(*tasks)
+            all_vacancies_ids.extend(chain(*results))
+            if not all(results):
+                break
+            page += batch_size
+
+    return pd.DataFrame(all_vacancies_ids, columns=["id"])
+
+
+async def get_vacancy_info_async(vacancies_id):
+    """
+    Get details of vacancies concurrently based on the provided vacancy IDs.
+    All pages are fetched with asyncio.gather, with at most 20 requests
+    in flight at a time.
+    Args:
+        vacancies_id (list): list of vacancy IDs to fetch details for.
+    Returns:
+        pd.DataFrame: DataFrame containing information about the vacancies.
+    """
+    semaphore = asyncio.Semaphore(20)
+
+    async def fetch_vacancy(session, vacancy_id):
+        url = "https://hh.ru/vacancy/" + vacancy_id
+        async with semaphore:
+            async with session.get(url) as response:
+                if response.status != 200:
+                    print("Error", response.status)
+                    return None
+                html = await response.read()
+        return parse_vacancy_page(vacancy_id, url, html)
+
+    connector = aiohttp.TCPConnector(limit=50, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        headers={"User-Agent": ua.random, "Accept-Encoding": "gzip, deflate, br"},
+    ) as session:
+        tasks = [fetch_vacancy(session, vacancy_id) for vacancy_id in vacancies_id]
+        rows = await asyncio.gather(*tasks)
+
+    data = [row for row in rows if row is not None]
+    return pd.DataFrame(data, columns=vacancy_columns)
 
 
 def str_to_list(string):
     """
     Convert a string representation of a list into a list.
+    Used for the skills column of the legacy CSV files; Parquet files
+    written by get_and_save_data keep the skills as real lists.
     Args:
-        string (str): a string representation of a list. The string should be formatted 
-                      as a Python list, with elements separated by commas and enclosed 
+        string (str): a string representation of a list. The string should be formatted
+                      as a Python list, with elements separated by commas and enclosed
                       in square brackets.
     Returns:
         list: a list containing the elements from the input string.
@@ -255,25 +555,25 @@ def str_to_date(str):
     Returns:
         date: a date object representing the input string.
     """
-    months = {
-        "января": "1",
-        "февраля": "2",
-        "марта": "3",
-        "апреля": "4",
-        "мая": "5",
-        "июня": "6",
-        "июля": "7",
-        "августа": "8",
-        "сентября": "9",
-        "октября": "10",
-        "ноября": "11",
-        "декабря": "12",
-    }
-    pattern = re.compile(r"([а-я]+)")
-    month = re.findall(pattern, str)
-    date = re.sub(pattern, months["".join(month)], str)
+    day, month, year = str.split()
 
-    return datetime.strptime(date, "%d %m %Y").date()
+    return date(int(year), months[month], int(day))
+
+
+def str_to_date_vec(dates):
+    """
+    Convert a whole Series of date strings into datetimes at once.
+    Args:
+        dates (pd.Series): Series of strings in the format "date monthname year".
+    Returns:
+        pd.Series: Series of datetime values, NaT for missing or
+                   unparseable dates.
+    """
+    parts = dates.str.split(expand=True)
+    month_number = parts[1].map(months).astype("Int64").astype(str)
+    iso = parts[2] + "-" + month_number + "-" + parts[0]
+
+    return pd.to_datetime(iso, format="%Y-%m-%d", errors="coerce")
 
 
 def categorize_vacancy(vacancy_name):
@@ -284,40 +584,27 @@ def categorize_vacancy(vacancy_name):
     Returns:
         str: the category of the vacancy.
     """
-    if re.search(
-        r"(.*data.+anal.*)|(.*data.+анал.*)|(.*анал.*дан.*)|(\bda\b)",
-        vacancy_name,
-        flags=re.IGNORECASE,
-    ):
-        return "Data Analyst"
-    elif re.search(
-        r"(.*bi.+anal.*)|(\bbi\b)|(.*bi.+анал.*)|(.*анал.*bi.*)",
-        vacancy_name,
-        flags=re.IGNORECASE,
-    ):
-        return "BI Analyst"
-    elif re.search(
-        r"(.*product.*)|(.*prod.+анал.*)|(.*анал.*прод.*)|(.*продукт.*)",
-        vacancy_name,
-        flags=re.IGNORECASE,
-    ):
-        return "Product Analyst"
-    elif re.search(
-        r"(.*веб.*)|(.*web.+анал.*)|(.*анал.*web.*)|(\bweb\b)",
-        vacancy_name,
-        flags=re.IGNORECASE,
-    ):
-        return "Web Analyst"
-    elif re.search(
-        r"(.*engin.*)|(.*инжен.*)|(\bde\b)", vacancy_name, flags=re.IGNORECASE
-    ):
-        return "Data Engineer"
-    elif re.search(
-        r"(.*data.+scien.*)|(.*scien.*)|(\bds\b)", vacancy_name, flags=re.IGNORECASE
-    ):
-        return "Data Scientist"
-    else:
-        return "Other"
+    for pattern, category in category_patterns:
+        if pattern.search(vacancy_name):
+            return category
+    return "Other"
+
+
+def categorize_vacancies_vec(vacancy_names):
+    """
+    Categorize a whole Series of vacancy names at once.
+    Args:
+        vacancy_names (pd.Series): Series containing the names of the vacancies.
+    Returns:
+        pd.Series: Series containing the category of each vacancy.
+    """
+    result = pd.Series("Other", index=vacancy_names.index)
+    for pattern, category in category_patterns:
+        mask = (result == "Other") & vacancy_names.str.contains(
+            pattern, regex=True, na=False
+        )
+        result[mask] = category
+    return result
 
 
 def skills_rating(df, specialization="Data Analyst"):
@@ -331,25 +618,17 @@ def skills_rating(df, specialization="Data Analyst"):
         list: a list of tuples, where each tuple contains a skill and its popularity 
               (as a percentage of total vacancies).
     """
-    data = df[(df["category"] == specialization)]
-
-    total_vacancies = 0
-    all_skills = []
-
-    for skill in data["skills"]:
-        if skill:
-            all_skills.extend(skill)
-            total_vacancies += 1
+    skills = df.loc[df["category"] == specialization, "skills"].dropna()
+    total_vacancies = len(skills)
+    counts = skills.explode().value_counts()
 
-    result = sorted(Counter(all_skills).items(), key=lambda x: x[1], reverse=True)
-
-    return [(skill, round((number / total_vacancies), 3)) for skill, number in result]
+    return list(zip(counts.index, (counts / total_vacancies).round(3)))
 
 
 def get_and_save_data(vacancies, experience, days_period=1):
     """
     This function fetches vacancies based on the provided vacancies, experience, and days_period.
-    It then fetches detailed information about these vacancies and saves them into a CSV file.
+    It then fetches detailed information about these vacancies and saves them into a Parquet file.
     Args:
         vacancies (list): a list of vacancy names to search for.
         experience (list): a list of experience levels to search for.
@@ -363,32 +642,33 @@ def get_and_save_data(vacancies, experience, days_period=1):
             vacancies, exp=exp, page=0, search_period=days_period
         )
         print(f"Getting information about vacancies with experience: {exp}")
-        df_new_info = get_vacancy_info(list(df_new_vacancies["id"]))
-
         current_date = date.today().strftime("%d-%m-%Y")
-        with open(f"{exp}_{current_date}", "w") as f:
-            f.write(df_new_info.to_csv())
-            print(f"The file {exp}_{current_date} was created\n")
+        file_name = f"{exp}_{current_date}.parquet"
+        get_vacancy_info(list(df_new_vacancies["id"]), output_path=file_name)
+        print(f"The file {file_name} was created\n")
 
     return None
 
 
 def download_data(date=date.today().strftime("%d-%m-%Y")):
     """
-    Downloads data from CSV files created by the get_and_save_data function.
+    Downloads data from Parquet files created by the get_and_save_data function.
     Args:
         date (str): The date in the format "dd-mm-yyyy". Default is the current date.
     Returns:
         pd.DataFrame: A DataFrame containing the downloaded data.
     """
-    files = [file for file in os.listdir() if re.search(date, file)]
-    result = pd.DataFrame()
-
-    for file in files:
-        df = pd.read_csv(open(file))
-        df = df.drop(columns=["Unnamed: 0"])
-        df.loc[df["skills"] == "[]", "skills"] = None
-        result = pd.concat([result, df])
+    files = [
+        file
+        for file in os.listdir()
+        if re.search(date, file) and file.endswith(".parquet")
+    ]
+    if not files:
+        return pd.DataFrame(columns=vacancy_columns)
+
+    frames = [pd.read_parquet(file) for file in files]
+    result = pd.concat(frames, ignore_index=True)
+    result.loc[result["skills"].str.len() == 0, "skills"] = None
 
     return result
 
@@ -402,11 +682,9 @@ def plot_vacancies(df):
     Returns:
         None. The function only displays a plot.
     """
-    data = sorted(Counter(df["category"]).items(), key=lambda x: x[1])
-    x = [value[0] for value in data]
-    y = [value[1] for value in data]
+    data = df["category"].value_counts().sort_values()
 
-    plt.bar(x, y, color=["orange"], width=0.5)
+    data.plot.bar(color="orange", width=0.5)
     plt.style.use("dark_background")
     plt.xticks(rotation=60)
     plt.grid(
@@ -428,11 +706,9 @@ def plot_exp(df):
     Returns:
         None. The function only displays a plot.
     """
-    data = Counter(df["experience"]).items()
-    x = [value[0] for value in data]
-    y = [value[1] for value in data]
+    data = df["experience"].value_counts()
 
-    plt.bar(x, y, color=["orange"], width=0.5)
+    data.plot.bar(color="orange", width=0.5)
     plt.style.use("dark_background")
     plt.xticks(rotation=60)
     plt.grid(
@@ -455,11 +731,9 @@ def plot_work_format(df):
     Returns:
         None. The function only displays a plot.
     """
-    data = sorted(Counter(df["busyness"]).items(), key=lambda x: x[1])
-    x = [value[0] for value in data]
-    y = [value[1] for value in data]
+    data = df["busyness"].value_counts().sort_values()
 
-    plt.bar(x, y, color=["orange"], width=0.4)
+    data.plot.bar(color="orange", width=0.4)
     plt.style.use("dark_background")
     plt.xticks(rotation=0)
     plt.grid(
@@ -482,10 +756,18 @@ def plot_map(df):
     Returns:
         map (folium.Map): a folium map object with the plotted circles.
     """
-    data = sorted(Counter(df["city"]).items(), key=lambda x: x[1], reverse=True)
+    data = df["city"].value_counts()
+
+    unique_cities = list(data.index)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(geocode_city, city) for city in unique_cities]
+        for future in futures:
+            try:
+                future.result()
+            except:
+                continue
 
     map = folium.Map(location=[55.7522, 37.6156], zoom_start=4)
-    geolocator = Nominatim(user_agent="myuseragent")
 
     def city_color(num_vacancies):
         if num_vacancies > 1000:
@@ -511,11 +793,11 @@ def plot_map(df):
         else:
             return 4
 
-    for city, num_vacancies in data:
+    for city, num_vacancies in data.items():
         try:
-            location = geolocator.geocode(city)
+            latitude, longitude = geocode_city(city)
             folium.CircleMarker(
-                location=[location.latitude, location.longitude],
+                location=[latitude, longitude],
                 radius=city_radius(num_vacancies),
                 tooltip=city,
                 popup=f"{num_vacancies}",
@@ -525,6 +807,7 @@ def plot_map(df):
         except:
             continue
 
+    save_geocache()
     return map
 
 